@@ -1,9 +1,9 @@
 """Cache Manager for storing context results."""
 
-import json
 import logging
+import pickle
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from cachetools import TTLCache
 
@@ -29,6 +29,8 @@ class CacheManager:
             ttl=ttl_seconds,
             getsizeof=self._get_size,
         )
+        self._hits = 0
+        self._misses = 0
         
         logger.info(
             f"Cache initialized with size: {Config.CACHE_SIZE_MB}MB, "
@@ -38,10 +40,12 @@ class CacheManager:
     def get(self, key: str) -> Optional[Dict[str, Any]]:
         """Get value from cache."""
         try:
-            value = self.cache.get(key)
-            if value:
+            entry = self.cache.get(key)
+            if entry:
+                self._hits += 1
                 logger.debug(f"Cache hit for key: {key}")
-                return json.loads(value)
+                return entry[0]
+            self._misses += 1
             logger.debug(f"Cache miss for key: {key}")
             return None
         except Exception as e:
@@ -51,8 +55,9 @@ class CacheManager:
     def set(self, key: str, value: Dict[str, Any]) -> bool:
         """Set value in cache."""
         try:
-            serialized = json.dumps(value)
-            self.cache[key] = serialized
+            # Values are stored as-is; the pickled length is only used for sizing
+            size = len(pickle.dumps(value, protocol=5))
+            self.cache[key] = (value, size)
             logger.debug(f"Cached value for key: {key}")
             return True
         except Exception as e:
@@ -70,11 +75,22 @@ class CacheManager:
             "size": len(self.cache),
             "max_size": self.cache.maxsize,
             "ttl": self.cache.ttl,
-            "hits": getattr(self.cache, "hits", 0),
-            "misses": getattr(self.cache, "misses", 0),
+            "hits": self._hits,
+            "misses": self._misses,
         }
     
     @staticmethod
-    def _get_size(value: str) -> int:
+    def _get_size(entry: Tuple[Dict[str, Any], int]) -> int:
         """Get size of cached value in bytes."""
-        return len(value.encode("utf-8"))
\ No newline at end of file
+        return entry[1]
+
+
+_cache_manager: Optional[CacheManager] = None
+
+
+def get_cache_manager() -> CacheManager:
+    """Get the process-wide cache manager, creating it on first use."""
+    global _cache_manager
+    if _cache_manager is None:
+        _cache_manager = CacheManager()
+    return _cache_manager
\ No newline at end of file
@@ -11,13 +11,21 @@ class Config:
     SOCKET_PATH: str = os.getenv("SERENA_MCP_SOCKET", "/tmp/serena-mcp.sock")
     HOST: str = os.getenv("SERENA_MCP_HOST", "127.0.0.1")
     PORT: int = int(os.getenv("SERENA_MCP_PORT", "9000"))
+    WORKERS: int = int(os.getenv("SERENA_MCP_WORKERS", "0"))  # 0 = one per CPU
     
     # Cache settings
     CACHE_SIZE_MB: int = int(os.getenv("SERENA_MCP_CACHE_SIZE", "512"))
     CACHE_TTL_DAYS: int = int(os.getenv("SERENA_MCP_CACHE_TTL", "14"))
+    INDEX_TTL_SECONDS: int = int(os.getenv("SERENA_MCP_INDEX_TTL", "60"))
+    NEGATIVE_CACHE_TTL_SECONDS: int = int(
+        os.getenv("SERENA_MCP_NEGATIVE_CACHE_TTL", "60")
+    )
     
     # LSP settings
     LSP_TIMEOUT_MS: int = int(os.getenv("SERENA_MCP_LSP_TIMEOUT", "5000"))
+    LSP_SOCKET_PATH: str = os.getenv(
+        "SERENA_MCP_LSP_SOCKET", "/tmp/serena-mcp-lsp.sock"
+    )
     
     # Token settings
     MAX_TOKENS: int = int(os.getenv("SERENA_MCP_MAX_TOKENS", "4096"))
@@ -27,4 +35,5 @@ class Config:
     LOG_FILE: Optional[str] = os.getenv("SERENA_MCP_LOG_FILE")
     
     # Development mode
-    DEBUG: bool = os.getenv("SERENA_MCP_DEBUG", "false").lower() == "true"
\ No newline at end of file
+    DEBUG: bool = os.getenv("SERENA_MCP_DEBUG", "false").lower() == "true"
+    RELOAD: bool = os.getenv("SERENA_MCP_RELOAD", "false").lower() == "true"
\ No newline at end of file
@@ -1,20 +1,131 @@
 """Context Manager for aggregating and optimizing code context."""
 
+import ast
+import asyncio
+import functools
 import hashlib
 import logging
 import os
 import re
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
 
+import orjson
 import tiktoken
+from cachetools import TTLCache
 
-from .cache_manager import CacheManager
+from .cache_manager import get_cache_manager
 from .config import Config
 from .lsp_client import LSPClient
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Upper bound on concurrent file reads offloaded to worker threads
+_SCAN_CONCURRENCY = min(32, (os.cpu_count() or 1) * 4)
+
+# Directories never worth indexing; other hidden ones still hold findable files
+_IGNORED_DIRS = frozenset({
+    ".git", ".venv", "venv", "node_modules", "__pycache__", ".mypy_cache", ".tox",
+    "dist", "build",
+})
+
+# Import statements (Python example)
+_IMPORT_RE = re.compile(r'^\s*(?:from\s+(\S+)\s+)?import\s+(.+)$', re.MULTILINE)
+
+
+async def _gather_in_threads(func: Callable[[str], T], items: List[str]) -> List[T]:
+    """Run blocking func over items on worker threads with bounded concurrency."""
+    sem = asyncio.Semaphore(_SCAN_CONCURRENCY)
+    
+    async def run(item: str) -> T:
+        async with sem:
+            return await asyncio.to_thread(func, item)
+    
+    return await asyncio.gather(*(run(item) for item in items))
+
+
+def _iter_files(root: str, hidden: bool = False) -> Iterator[Tuple[str, str, bool]]:
+    """Yield (name, path, hidden) for files under root, pruning ignored directories.
+    
+    Like os.walk top-down, a directory's files come before its subdirectories',
+    so shallower matches are found first. hidden marks files below a
+    dot-directory, which symbol search skips.
+    """
+    try:
+        with os.scandir(root) as it:
+            entries = list(it)
+    except OSError:
+        return
+    
+    subdirs = []
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name not in _IGNORED_DIRS:
+                subdirs.append(entry)
+        else:
+            yield entry.name, entry.path, hidden
+    
+    for entry in subdirs:
+        yield from _iter_files(entry.path, hidden or entry.name.startswith('.'))
+
+
+@functools.lru_cache(maxsize=1024)
+def _read_source(file_path: str, mtime_ns: int) -> str:
+    """Read a source file; keyed by mtime so edits invalidate the entry."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def _parse_symbol_names(file_path: str) -> FrozenSet[str]:
+    """Parse class and function names defined in a Python file.
+    
+    Reads the file directly so indexing does not crowd _read_source's cache.
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=file_path)
+    
+    return frozenset(
+        node.name
+        for node in ast.walk(tree)
+        if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef))
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_imports(file_path: str, mtime_ns: int) -> Tuple[str, ...]:
+    """Extract imported module names from a Python file, in source order."""
+    content = _read_source(file_path, mtime_ns)
+    modules = []
+    for match in _IMPORT_RE.finditer(content):
+        modules.append(match.group(1) or match.group(2).split()[0])
+    return tuple(modules)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_encoder() -> tiktoken.Encoding:
+    """Load the tiktoken encoder once per process."""
+    return tiktoken.encoding_for_model("gpt-4")
+
+
+@functools.lru_cache(maxsize=512)
+def _count_file_tokens(file_path: str, mtime_ns: int) -> int:
+    """Count tokens in a file; keyed by mtime so edits invalidate the entry."""
+    return len(_get_encoder().encode_ordinary(_read_source(file_path, mtime_ns)))
+
 
 class ContextManager:
     """Manages context extraction and optimization."""
@@ -22,9 +133,27 @@ class ContextManager:
     def __init__(self, lsp_client: LSPClient):
         """Initialize context manager."""
         self.lsp_client = lsp_client
-        self.cache = CacheManager()
-        self.encoder = tiktoken.encoding_for_model("gpt-4")
+        self.cache = get_cache_manager()
         self.workspace_root = os.getcwd()
+        
+        # Workspace index, rebuilt every Config.INDEX_TTL_SECONDS
+        self._file_index: Dict[str, List[str]] = {}
+        self._symbol_index: Dict[str, List[str]] = {}
+        self._file_symbols: Dict[str, FrozenSet[str]] = {}
+        self._file_mtimes: Dict[str, int] = {}
+        self._index_built_at: Optional[float] = None
+        self._index_lock = asyncio.Lock()
+        
+        # Queries that found nothing, and extractions currently running
+        self._negative_cache: TTLCache = TTLCache(
+            maxsize=256, ttl=Config.NEGATIVE_CACHE_TTL_SECONDS
+        )
+        self._inflight: Dict[str, asyncio.Task] = {}
+    
+    @property
+    def encoder(self) -> tiktoken.Encoding:
+        """Shared tiktoken encoder, loaded on first use."""
+        return _get_encoder()
     
     async def get_context(
         self,
@@ -42,11 +171,33 @@ class ContextManager:
             logger.info(f"Cache hit for query: {query}")
             return cached_result
         
+        if cache_key in self._negative_cache:
+            logger.debug(f"Negative cache hit for query: {query}")
+            return self._empty_result()
+        
+        # Share one extraction between concurrent identical queries
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.create_task(
+                self._extract_context(query, scope, cache_key)
+            )
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+        
+        return await asyncio.shield(task)
+    
+    async def _extract_context(
+        self,
+        query: str,
+        scope: str,
+        cache_key: str
+    ) -> Dict[str, Any]:
+        """Extract context for a query that missed the cache."""
         # Extract context based on scope
         logger.info(f"Extracting context for query: {query} with scope: {scope}")
         
         # Parse the query to identify file and symbol
-        file_path, symbol_name = self._parse_query(query)
+        file_path, symbol_name = await self._parse_query(query)
         
         if not file_path:
             # Search for symbol across workspace
@@ -54,15 +205,20 @@ class ContextManager:
         
         if not file_path:
             logger.warning(f"Could not find file for query: {query}")
+            self._negative_cache[cache_key] = True
             return self._empty_result()
         
         # Extract symbols based on scope
         symbols = await self._extract_symbols(file_path, symbol_name, scope)
-        dependencies = await self._extract_dependencies(symbols)
-        references = await self._extract_references(symbols)
+        
+        # Dependencies, LSP references and the raw estimate are independent
+        dependencies, references, raw_tokens = await asyncio.gather(
+            self._extract_dependencies(symbols),
+            self._extract_references(symbols),
+            self._estimate_raw_tokens(file_path, scope),
+        )
         
         # Calculate token savings
-        raw_tokens = await self._estimate_raw_tokens(file_path, scope)
         optimized_tokens = self._count_tokens(symbols, dependencies, references)
         tokens_saved = max(0, raw_tokens - optimized_tokens)
         
@@ -81,9 +237,10 @@ class ContextManager:
     def _generate_cache_key(self, query: str, scope: str, max_tokens: int) -> str:
         """Generate cache key for the request."""
         key_data = f"{query}:{scope}:{max_tokens}"
-        return hashlib.sha256(key_data.encode()).hexdigest()
+        # In-memory key only; blake2b is cheaper than sha256 for short inputs
+        return hashlib.blake2b(key_data.encode(), digest_size=16).hexdigest()
     
-    def _parse_query(self, query: str) -> Tuple[Optional[str], str]:
+    async def _parse_query(self, query: str) -> Tuple[Optional[str], str]:
         """Parse query to extract file path and symbol name.
         
         Examples:
@@ -97,7 +254,7 @@ class ContextManager:
             if os.path.exists(file_part):
                 return file_part, symbol_part
             # Try to find file in workspace
-            found_file = self._find_file_in_workspace(file_part)
+            found_file = await self._find_file_in_workspace(file_part)
             if found_file:
                 return found_file, symbol_part
             # Return None for file_path if not found, but keep the symbol
@@ -112,34 +269,122 @@ class ContextManager:
         # Just a symbol name
         return None, query
     
-    def _find_file_in_workspace(self, file_name: str) -> Optional[str]:
+    async def _find_file_in_workspace(self, file_name: str) -> Optional[str]:
         """Find file in workspace by name."""
-        for root, dirs, files in os.walk(self.workspace_root):
-            if file_name in files:
-                return os.path.join(root, file_name)
+        await self._ensure_index()
+        for file_path in self._file_index.get(file_name, []):
+            if os.path.exists(file_path):
+                return file_path
         return None
     
     async def _find_symbol_file(self, symbol_name: str) -> Optional[str]:
         """Find file containing the given symbol."""
         # Search Python files for now
         # TODO: Extend to other languages
-        for root, dirs, files in os.walk(self.workspace_root):
-            # Skip hidden directories
-            dirs[:] = [d for d in dirs if not d.startswith('.')]
-            
-            for file in files:
-                if file.endswith('.py'):
-                    file_path = os.path.join(root, file)
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                            # Simple pattern matching for class/function definitions
-                            if re.search(rf'^\s*(class|def)\s+{symbol_name}\b', content, re.MULTILINE):
-                                return file_path
-                    except Exception:
-                        continue
+        await self._ensure_index()
+        for file_path in list(self._symbol_index.get(symbol_name, [])):
+            if self._is_stale(file_path):
+                scanned = await asyncio.to_thread(self._scan_file, file_path)
+                self._index_file(file_path, scanned)
+            if symbol_name in self._file_symbols.get(file_path, frozenset()):
+                return file_path
         return None
     
+    async def _ensure_index(self) -> None:
+        """Build the workspace index if it is missing or expired."""
+        async with self._index_lock:
+            if (
+                self._index_built_at is not None
+                and time.monotonic() - self._index_built_at < Config.INDEX_TTL_SECONDS
+            ):
+                return
+            
+            file_index, py_files = await asyncio.to_thread(self._walk_workspace)
+            
+            # Carry unchanged files over from the previous index unparsed
+            indexed = {
+                file_path: (mtime, self._file_symbols[file_path])
+                for file_path, mtime in self._file_mtimes.items()
+            }
+            results = await _gather_in_threads(
+                lambda file_path: self._scan_file(file_path, indexed.get(file_path)),
+                py_files,
+            )
+            
+            self._file_index = file_index
+            self._negative_cache.clear()
+            self._symbol_index = {}
+            self._file_symbols = {}
+            self._file_mtimes = {}
+            for file_path, scanned in zip(py_files, results):
+                self._index_file(file_path, scanned)
+            
+            self._index_built_at = time.monotonic()
+            logger.debug(
+                f"Indexed {len(self._file_mtimes)} Python files, "
+                f"{len(self._symbol_index)} symbols"
+            )
+    
+    def _walk_workspace(self) -> Tuple[Dict[str, List[str]], List[str]]:
+        """Map file names to paths, and list Python files outside hidden dirs."""
+        file_index: Dict[str, List[str]] = {}
+        py_files: List[str] = []
+        for file_name, file_path, hidden in _iter_files(self.workspace_root):
+            file_index.setdefault(file_name, []).append(file_path)
+            if not hidden and file_name.endswith('.py'):
+                py_files.append(file_path)
+        return file_index, py_files
+    
+    @staticmethod
+    def _scan_file(
+        file_path: str,
+        indexed: Optional[Tuple[int, FrozenSet[str]]] = None
+    ) -> Optional[Tuple[int, FrozenSet[str]]]:
+        """Stat and parse a Python file, returning its mtime and symbol names.
+        
+        An indexed (mtime, names) entry that is still current is returned as is.
+        """
+        try:
+            mtime = os.stat(file_path).st_mtime_ns
+            if indexed is not None and indexed[0] == mtime:
+                return indexed
+            return mtime, _parse_symbol_names(file_path)
+        except (OSError, SyntaxError, ValueError):
+            return None
+    
+    def _index_file(
+        self,
+        file_path: str,
+        scanned: Optional[Tuple[int, FrozenSet[str]]]
+    ) -> None:
+        """(Re)index class and function names defined in a Python file."""
+        # Queries that missed before may now resolve to this file
+        self._negative_cache.clear()
+        
+        for name in self._file_symbols.pop(file_path, frozenset()):
+            paths = self._symbol_index.get(name, [])
+            if file_path in paths:
+                paths.remove(file_path)
+            if not paths:
+                self._symbol_index.pop(name, None)
+        self._file_mtimes.pop(file_path, None)
+        
+        if scanned is None:
+            return
+        
+        mtime, names = scanned
+        self._file_mtimes[file_path] = mtime
+        self._file_symbols[file_path] = names
+        for name in names:
+            self._symbol_index.setdefault(name, []).append(file_path)
+    
+    def _is_stale(self, file_path: str) -> bool:
+        """Check whether an indexed file changed since it was indexed."""
+        try:
+            return os.stat(file_path).st_mtime_ns != self._file_mtimes.get(file_path)
+        except OSError:
+            return True
+    
     async def _extract_symbols(self, file_path: str, symbol_name: str, scope: str) -> List[Dict[str, Any]]:
         """Extract relevant symbols based on file, symbol name and scope."""
         symbols = []
@@ -206,43 +451,46 @@ class ContextManager:
         dependencies = []
         seen_modules = set()
         
-        for symbol in symbols:
-            file_path = symbol["location"]["file"]
-            if not os.path.exists(file_path):
-                continue
-            
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                # Extract import statements (Python example)
-                import_pattern = r'^\s*(?:from\s+(\S+)\s+)?import\s+(.+)$'
-                for match in re.finditer(import_pattern, content, re.MULTILINE):
-                    module = match.group(1) or match.group(2).split()[0]
-                    if module and module not in seen_modules:
-                        seen_modules.add(module)
-                        dependencies.append({
-                            "module": module,
-                            "summary": f"Imported by {os.path.basename(file_path)}",
-                        })
-            except Exception:
-                continue
+        # Read each distinct file once, concurrently
+        file_paths = list(
+            dict.fromkeys(symbol["location"]["file"] for symbol in symbols)
+        )
+        all_imports = await _gather_in_threads(self._scan_imports, file_paths)
+        
+        for file_path, modules in zip(file_paths, all_imports):
+            for module in modules:
+                if module and module not in seen_modules:
+                    seen_modules.add(module)
+                    dependencies.append({
+                        "module": module,
+                        "summary": f"Imported by {os.path.basename(file_path)}",
+                    })
         
         return dependencies
     
+    @staticmethod
+    def _scan_imports(file_path: str) -> Tuple[str, ...]:
+        """Get modules imported by a file, or none if it cannot be read."""
+        try:
+            return _parse_imports(file_path, os.stat(file_path).st_mtime_ns)
+        except (OSError, ValueError):
+            return ()
+    
     async def _extract_references(self, symbols: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Extract references for the given symbols."""
         references = []
         
-        for symbol in symbols:
-            file_path = symbol["location"]["file"]
-            line = symbol["location"]["line"]
-            
-            # Get references via LSP
-            refs = await self.lsp_client.get_references(
-                file_path,
-                {"line": line, "character": 0}
+        # Get references via LSP, all symbols in flight at once
+        all_refs = await asyncio.gather(*(
+            self.lsp_client.get_references(
+                symbol["location"]["file"],
+                {"line": symbol["location"]["line"], "character": 0}
             )
+            for symbol in symbols
+        ))
+        
+        for symbol, refs in zip(symbols, all_refs):
+            file_path = symbol["location"]["file"]
             
             for ref in refs[:5]:  # Limit to 5 references
                 ref_file = ref.get("uri", "").replace("file://", "")
@@ -263,9 +511,6 @@ class ContextManager:
             return 0
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
             if scope == "function":
                 # Estimate ~500 tokens per function
                 return 500
@@ -273,8 +518,9 @@ class ContextManager:
                 # Estimate ~2000 tokens per class
                 return 2000
             else:  # file
-                # Count actual tokens
-                return len(self.encoder.encode(content))
+                # Count actual tokens, cached until the file changes
+                mtime_ns = os.stat(file_path).st_mtime_ns
+                return await asyncio.to_thread(_count_file_tokens, file_path, mtime_ns)
         except Exception:
             return 1000  # Default estimate
     
@@ -285,14 +531,14 @@ class ContextManager:
         references: List[Dict[str, Any]]
     ) -> int:
         """Count tokens in the optimized context."""
-        # Convert to string representation
-        context_str = str({
+        # Serialize as the JSON payload the client actually receives
+        payload = orjson.dumps({
             "symbols": symbols,
             "dependencies": dependencies,
             "references": references,
         })
         
-        return len(self.encoder.encode(context_str))
+        return len(self.encoder.encode_ordinary(payload.decode("utf-8")))
     
     def _empty_result(self) -> Dict[str, Any]:
         """Return empty result when no context found."""
@@ -350,36 +596,70 @@ class ContextManager:
             }
         
         try:
-            # Read current file content
+            # Read current file as lines that keep their newline. A final
+            # unterminated element (possibly empty) mirrors str.split('\n')
             with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            lines = content.split('\n')
-            edits_applied = 0
+                lines = f.readlines()
+            if not lines or lines[-1].endswith('\n'):
+                lines.append('')
             
-            # Sort edits by line number in reverse order to avoid offset issues
-            sorted_edits = sorted(edits, key=lambda x: x.get('line', 0), reverse=True)
+            # Bucket edits by type. Line numbers refer to the file as read,
+            # so edits never shift each other regardless of their order
+            replaces: Dict[int, str] = {}
+            inserts: Dict[int, List[str]] = {}
+            deletes: Set[int] = set()
             
-            for edit in sorted_edits:
+            for edit in edits:
                 edit_type = edit.get('type', 'replace')
                 line_num = edit.get('line', 0)
                 new_text = edit.get('text', '')
                 
                 if edit_type == 'replace' and 0 <= line_num < len(lines):
-                    lines[line_num] = new_text
-                    edits_applied += 1
-                elif edit_type == 'insert':
-                    if 0 <= line_num <= len(lines):
-                        lines.insert(line_num, new_text)
-                        edits_applied += 1
-                elif edit_type == 'delete':
-                    if 0 <= line_num < len(lines):
-                        del lines[line_num]
-                        edits_applied += 1
+                    replaces[line_num] = new_text
+                elif edit_type == 'insert' and 0 <= line_num <= len(lines):
+                    inserts.setdefault(line_num, []).append(new_text)
+                elif edit_type == 'delete' and 0 <= line_num < len(lines):
+                    deletes.add(line_num)
+            
+            # Count edits that take effect: repeated replaces or deletes of a
+            # line collapse into one, and a delete overrides a replace
+            edits_applied = (
+                len(deletes)
+                + len(replaces.keys() - deletes)
+                + sum(len(texts) for texts in inserts.values())
+            )
             
-            # Write back to file
+            # Rebuild in one pass: inserts go before the original line
+            new_lines = []
+            for i, line in enumerate(lines):
+                new_lines.extend(text + '\n' for text in inserts.get(i, ()))
+                if i in deletes:
+                    continue
+                if i in replaces:
+                    new_lines.append(replaces[i] + '\n')
+                else:
+                    new_lines.append(line)
+            
+            appended = inserts.get(len(lines), ())
+            if appended and new_lines and not new_lines[-1].endswith('\n'):
+                new_lines[-1] += '\n'
+            new_lines.extend(text + '\n' for text in appended)
+            
+            # Like str.split('\n'), the final line carries no terminator
+            if new_lines and new_lines[-1].endswith('\n'):
+                new_lines[-1] = new_lines[-1][:-1]
+            lines = new_lines
+            
+            # Write back to file without building one joined string
             with open(file_path, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(lines))
+                f.writelines(lines)
+            self._negative_cache.clear()
+            
+            # Keep the symbol index current so new definitions are findable
+            if file_path.endswith('.py'):
+                indexed_path = os.path.abspath(file_path)
+                scanned = await asyncio.to_thread(self._scan_file, indexed_path)
+                self._index_file(indexed_path, scanned)
             
             return {
                 "success": True,
@@ -1,14 +1,12 @@
 """LSP Client for communicating with language servers."""
 
 import asyncio
-import json
 import logging
 import os
-import subprocess
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-from pylsp_jsonrpc import streams
+import orjson
 
 from .config import Config
 
@@ -22,23 +20,25 @@ class LSPServerProcess:
         """Initialize LSP server process."""
         self.language = language
         self.command = command
-        self.process: Optional[subprocess.Popen] = None
-        self.reader: Optional[streams.JsonRpcStreamReader] = None
-        self.writer: Optional[streams.JsonRpcStreamWriter] = None
+        self.process: Optional[asyncio.subprocess.Process] = None
         self._request_id = 0
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reader_task: Optional[asyncio.Task] = None
+        self._buffer = bytearray()
+        self.closed = False  # Set once the server's output stream has ended
     
     async def start(self):
         """Start the language server process."""
         try:
-            self.process = subprocess.Popen(
-                self.command,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+            # stderr is discarded: an unread pipe would stall a chatty server
+            self.process = await asyncio.create_subprocess_exec(
+                *self.command,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
             )
             
-            self.reader = streams.JsonRpcStreamReader(self.process.stdout)
-            self.writer = streams.JsonRpcStreamWriter(self.process.stdin)
+            self._reader_task = asyncio.create_task(self._read_loop())
             
             # Initialize the server
             await self._initialize()
@@ -55,16 +55,21 @@ class LSPServerProcess:
                 # Send shutdown request
                 await self._request("shutdown", {})
                 # Send exit notification
-                self._notify("exit", {})
+                await self._notify("exit", {})
                 
                 # Wait for process to exit
-                self.process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
+                await asyncio.wait_for(self.process.wait(), timeout=5)
+            except asyncio.TimeoutError:
                 self.process.kill()
+            except ConnectionError:
+                # Server already exited; there is nothing left to shut down
+                pass
             finally:
+                if self._reader_task:
+                    self._reader_task.cancel()
+                    self._reader_task = None
+                self._buffer.clear()
                 self.process = None
-                self.reader = None
-                self.writer = None
     
     async def _initialize(self):
         """Send initialize request to server."""
@@ -81,7 +86,7 @@ class LSPServerProcess:
         }
         
         result = await self._request("initialize", params)
-        self._notify("initialized", {})
+        await self._notify("initialized", {})
         return result
     
     def _get_next_id(self) -> int:
@@ -91,35 +96,96 @@ class LSPServerProcess:
     
     async def _request(self, method: str, params: Dict[str, Any]) -> Any:
         """Send request and wait for response."""
-        msg_id = self._get_next_id()
+        if self.closed:
+            raise ConnectionError(f"{self.language} server connection closed")
         
-        self.writer.write({
-            "jsonrpc": "2.0",
-            "id": msg_id,
-            "method": method,
-            "params": params,
-        })
+        msg_id = self._get_next_id()
+        future = asyncio.get_running_loop().create_future()
+        self._pending[msg_id] = future
         
-        # Read messages until we get our response
-        while True:
-            raw_msg = self.reader._read_message()
-            if raw_msg is None:
-                continue
-            # Decode if bytes
-            if isinstance(raw_msg, bytes):
-                import json
-                msg = json.loads(raw_msg.decode('utf-8'))
-            else:
-                msg = raw_msg
+        try:
+            await self._write({
+                "jsonrpc": "2.0",
+                "id": msg_id,
+                "method": method,
+                "params": params,
+            })
+            return await future
+        finally:
+            self._pending.pop(msg_id, None)
+    
+    async def _read_loop(self):
+        """Read server messages and resolve the matching pending requests."""
+        try:
+            while True:
+                msg = await self._read_frame()
+                if msg is None:
+                    break
+                
+                # Skip server-initiated requests and notifications
+                if "method" in msg:
+                    continue
+                
+                future = self._pending.get(msg.get("id"))
+                if future is None or future.done():
+                    continue
                 
-            if msg.get("id") == msg_id:
                 if "error" in msg:
-                    raise Exception(f"LSP error: {msg['error']}")
-                return msg.get("result")
+                    future.set_exception(Exception(f"LSP error: {msg['error']}"))
+                else:
+                    future.set_result(msg.get("result"))
+        except Exception as e:
+            logger.error(f"Error reading from {self.language} server: {e}")
+        finally:
+            # Later requests fail fast instead of waiting on a dead server
+            self.closed = True
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(
+                        ConnectionError(f"{self.language} server connection closed")
+                    )
     
-    def _notify(self, method: str, params: Dict[str, Any]):
+    async def _read_frame(self) -> Optional[Dict[str, Any]]:
+        """Read and decode one Content-Length framed message, or None at EOF."""
+        stdout = self.process.stdout
+        buf = self._buffer
+        
+        try:
+            while (header_end := buf.find(b"\r\n\r\n")) < 0:
+                chunk = await stdout.read(4096)
+                if not chunk:
+                    return None
+                buf += chunk
+            
+            start = buf.find(b"Content-Length:", 0, header_end)
+            if start < 0:
+                raise ValueError("Missing Content-Length header")
+            start += len(b"Content-Length:")
+            end = buf.find(b"\r\n", start, header_end)
+            content_length = int(buf[start:end if end >= 0 else header_end])
+            
+            body_start = header_end + 4
+            body_end = body_start + content_length
+            if len(buf) < body_end:
+                buf += await stdout.readexactly(body_end - len(buf))
+        except asyncio.IncompleteReadError:
+            return None
+        
+        # Decode straight from the buffer, then drop the consumed frame
+        with memoryview(buf) as view:
+            msg = orjson.loads(view[body_start:body_end])
+        del buf[:body_end]
+        return msg
+    
+    async def _write(self, message: Dict[str, Any]):
+        """Write a Content-Length framed message to the server."""
+        body = orjson.dumps(message)
+        self.process.stdin.write(b"Content-Length: %d\r\n\r\n%s" % (len(body), body))
+        await self.process.stdin.drain()
+    
+    async def _notify(self, method: str, params: Dict[str, Any]):
         """Send notification (no response expected)."""
-        self.writer.write({
+        await self._write({
             "jsonrpc": "2.0",
             "method": method,
             "params": params,
@@ -170,39 +236,68 @@ class LSPClient:
     
     def __init__(self):
         """Initialize LSP client."""
-        self.servers: Dict[str, LSPServerProcess] = {}
+        self.servers: Dict[str, asyncio.Task] = {}
         self.initialized = False
     
     async def initialize(self):
-        """Initialize connections to language servers."""
-        logger.info("Initializing LSP connections...")
-        
-        # Start Python language server by default
-        await self._start_server("python")
+        """Initialize connections to language servers.
         
+        Servers are started lazily by the first request for their language.
+        """
+        logger.info("Initializing LSP connections...")
         self.initialized = True
     
     async def shutdown(self):
         """Shutdown all LSP connections."""
         logger.info("Shutting down LSP connections...")
         
-        for server in self.servers.values():
-            await server.stop()
+        results = await asyncio.gather(*self.servers.values(), return_exceptions=True)
+        for server in results:
+            if isinstance(server, LSPServerProcess):
+                await server.stop()
         
         self.servers.clear()
         self.initialized = False
     
-    async def _start_server(self, language: str):
-        """Start a language server for the given language."""
+    def _start_server(self, language: str) -> Optional[asyncio.Task]:
+        """Start a language server in the background if not already running."""
         if language not in self.LANGUAGE_SERVERS:
             logger.warning(f"No language server configured for {language}")
-            return
+            return None
         
         if language not in self.servers:
-            command = self.LANGUAGE_SERVERS[language]
-            server = LSPServerProcess(language, command)
-            await server.start()
-            self.servers[language] = server
+            self.servers[language] = asyncio.create_task(self._spawn(language))
+        return self.servers[language]
+    
+    async def _spawn(self, language: str) -> LSPServerProcess:
+        """Create and start the server process for a language."""
+        server = LSPServerProcess(language, self.LANGUAGE_SERVERS[language])
+        await server.start()
+        return server
+    
+    async def _get_server(self, language: str) -> Optional[LSPServerProcess]:
+        """Wait for the language's server to be ready, starting it if needed."""
+        task = self._start_server(language)
+        if task is None:
+            return None
+        
+        try:
+            server = await asyncio.shield(task)
+        except Exception:
+            # Let the next request retry a server that failed to start
+            if self.servers.get(language) is task:
+                del self.servers[language]
+            raise
+        
+        if server.closed:
+            # The server has exited since it started; replace it
+            logger.warning(f"{language} server exited, restarting")
+            if self.servers.get(language) is task:
+                del self.servers[language]
+                await server.stop()
+            return await self._get_server(language)
+        
+        return server
     
     def _get_language_from_file(self, file_path: str) -> str:
         """Determine language from file extension."""
@@ -226,11 +321,11 @@ class LSPClient:
         language = self._get_language_from_file(file_path)
         
         # Ensure server is started
-        await self._start_server(language)
+        server = await self._get_server(language)
         
-        if language in self.servers:
+        if server:
             file_uri = f"file://{os.path.abspath(file_path)}"
-            return await self.servers[language].get_definition(
+            return await server.get_definition(
                 file_uri, position["line"], position["character"]
             )
         
@@ -241,11 +336,11 @@ class LSPClient:
         language = self._get_language_from_file(file_path)
         
         # Ensure server is started
-        await self._start_server(language)
+        server = await self._get_server(language)
         
-        if language in self.servers:
+        if server:
             file_uri = f"file://{os.path.abspath(file_path)}"
-            return await self.servers[language].get_references(
+            return await server.get_references(
                 file_uri, position["line"], position["character"]
             )
         
@@ -256,10 +351,10 @@ class LSPClient:
         language = self._get_language_from_file(file_path)
         
         # Ensure server is started
-        await self._start_server(language)
+        server = await self._get_server(language)
         
-        if language in self.servers:
+        if server:
             file_uri = f"file://{os.path.abspath(file_path)}"
-            return await self.servers[language].get_symbols(file_uri)
+            return await server.get_symbols(file_uri)
         
         return []
\ No newline at end of file
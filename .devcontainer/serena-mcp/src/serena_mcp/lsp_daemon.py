@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""LSP daemon sharing one set of language servers between server workers."""
+
+import asyncio
+import logging
+import os
+import signal
+import stat
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import orjson
+import uvloop
+
+from .config import Config
+from .lsp_client import LSPClient
+
+logger = logging.getLogger(__name__)
+
+# Largest single newline-delimited message accepted on the socket
+MESSAGE_LIMIT = 64 * 1024 * 1024
+
+
+class LSPDaemon:
+    """Serves LSPClient queries to worker processes over a Unix socket."""
+    
+    METHODS = ("get_definition", "get_references", "get_symbols")
+    
+    def __init__(self, socket_path: str = Config.LSP_SOCKET_PATH):
+        """Initialize LSP daemon."""
+        self.socket_path = socket_path
+        self.lsp_client = LSPClient()
+    
+    async def serve(self):
+        """Listen on the socket until cancelled."""
+        await self.lsp_client.initialize()
+        
+        socket_path = Path(self.socket_path)
+        if socket_path.exists():
+            socket_path.unlink()
+        
+        server = await asyncio.start_unix_server(
+            self._handle_connection, path=self.socket_path, limit=MESSAGE_LIMIT
+        )
+        logger.info(f"LSP daemon listening on {self.socket_path}")
+        
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.lsp_client.shutdown()
+            if socket_path.exists():
+                socket_path.unlink()
+    
+    async def _handle_connection(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ):
+        """Handle requests from one worker, concurrently."""
+        in_flight = set()
+        
+        try:
+            while line := await reader.readline():
+                task = asyncio.create_task(self._handle_request(line, writer))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+        except (ConnectionError, ValueError) as e:
+            logger.error(f"Error reading from worker: {e}")
+        finally:
+            for task in in_flight:
+                task.cancel()
+            writer.close()
+    
+    async def _handle_request(self, line: bytes, writer: asyncio.StreamWriter):
+        """Run one forwarded LSPClient call and write its response."""
+        request_id = None
+        try:
+            request = orjson.loads(line)
+            request_id = request["id"]
+            method = request["method"]
+            if method not in self.METHODS:
+                raise ValueError(f"Unknown method: {method}")
+            result = await getattr(self.lsp_client, method)(*request["params"])
+            response = {"id": request_id, "result": result}
+        except Exception as e:
+            logger.error(f"Error handling daemon request: {e}")
+            response = {"id": request_id, "error": str(e)}
+        
+        if not writer.is_closing():
+            writer.write(orjson.dumps(response) + b"\n")
+            await writer.drain()
+
+
+class LSPDaemonClient:
+    """Drop-in LSPClient replacement that forwards calls to an LSPDaemon.
+    
+    If the daemon goes away, the client reconnects once and otherwise falls
+    back to running language servers in-process, as a plain LSPClient would.
+    """
+    
+    def __init__(self, socket_path: str = Config.LSP_SOCKET_PATH):
+        """Initialize daemon client."""
+        self.socket_path = socket_path
+        self.initialized = False
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._request_id = 0
+        self._reconnect_lock = asyncio.Lock()
+        self._fallback: Optional[LSPClient] = None
+    
+    async def initialize(self):
+        """Connect to the daemon."""
+        await self._connect()
+        self.initialized = True
+        logger.info(f"Connected to LSP daemon at {self.socket_path}")
+    
+    async def shutdown(self):
+        """Disconnect from the daemon; the daemon keeps its servers running."""
+        self._disconnect()
+        if self._fallback:
+            await self._fallback.shutdown()
+            self._fallback = None
+        self.initialized = False
+    
+    async def _connect(self):
+        """Open the daemon connection and start reading responses."""
+        self._reader, self._writer = await asyncio.open_unix_connection(
+            self.socket_path, limit=MESSAGE_LIMIT
+        )
+        self._reader_task = asyncio.create_task(self._read_loop())
+    
+    def _disconnect(self):
+        """Close the daemon connection, if any."""
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+        if self._reader_task:
+            self._reader_task.cancel()
+            self._reader_task = None
+    
+    async def _reconnect(self, lost: Optional[asyncio.StreamWriter]):
+        """Replace the lost connection, or fall back to in-process servers."""
+        async with self._reconnect_lock:
+            # A concurrent call may already have recovered
+            if self._fallback or self._writer is not lost:
+                return
+            
+            self._disconnect()
+            try:
+                await self._connect()
+                logger.info(f"Reconnected to LSP daemon at {self.socket_path}")
+            except OSError:
+                logger.warning(
+                    "LSP daemon unavailable, starting language servers in-process"
+                )
+                self._fallback = LSPClient()
+                await self._fallback.initialize()
+    
+    async def _call(self, method: str, *params: Any) -> Any:
+        """Run an LSPClient method via the daemon, recovering a lost connection."""
+        if not self._fallback:
+            writer = self._writer
+            try:
+                return await self._request(method, *params)
+            except ConnectionError:
+                await self._reconnect(writer)
+                if not self._fallback:
+                    return await self._request(method, *params)
+        return await getattr(self._fallback, method)(*params)
+    
+    async def _request(self, method: str, *params: Any) -> Any:
+        """Forward a call and wait for its result."""
+        # Nothing resolves futures once the reader has stopped
+        if self._reader_task is None or self._reader_task.done():
+            raise ConnectionError("LSP daemon connection closed")
+        
+        self._request_id += 1
+        msg_id = self._request_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[msg_id] = future
+        
+        try:
+            message = {"id": msg_id, "method": method, "params": params}
+            self._writer.write(orjson.dumps(message) + b"\n")
+            await self._writer.drain()
+            return await future
+        finally:
+            self._pending.pop(msg_id, None)
+    
+    async def _read_loop(self):
+        """Resolve pending calls as responses arrive."""
+        try:
+            while line := await self._reader.readline():
+                msg = orjson.loads(line)
+                future = self._pending.get(msg.get("id"))
+                if future is None or future.done():
+                    continue
+                if "error" in msg:
+                    future.set_exception(
+                        Exception(f"LSP daemon error: {msg['error']}")
+                    )
+                else:
+                    future.set_result(msg.get("result"))
+        except Exception as e:
+            logger.error(f"Error reading from LSP daemon: {e}")
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(
+                        ConnectionError("LSP daemon connection closed")
+                    )
+    
+    async def get_definition(
+        self,
+        file_path: str,
+        position: Dict[str, int]
+    ) -> Optional[Dict[str, Any]]:
+        """Get definition for symbol at given position."""
+        return await self._call("get_definition", file_path, position)
+    
+    async def get_references(
+        self,
+        file_path: str,
+        position: Dict[str, int]
+    ) -> List[Dict[str, Any]]:
+        """Get all references for symbol at given position."""
+        return await self._call("get_references", file_path, position)
+    
+    async def get_symbols(self, file_path: str) -> List[Dict[str, Any]]:
+        """Get all symbols in a file."""
+        return await self._call("get_symbols", file_path)
+
+
+async def _watch_parent(task: asyncio.Task):
+    """Cancel task once stdin hits EOF, i.e. the launching process is gone."""
+    reader = asyncio.StreamReader()
+    await asyncio.get_running_loop().connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader), sys.stdin
+    )
+    while await reader.read(4096):
+        pass
+    logger.info("Parent process exited, stopping LSP daemon")
+    task.cancel()
+
+
+async def main():
+    """Main entry point."""
+    # Cancel serve() on termination so language servers are shut down cleanly
+    loop = asyncio.get_running_loop()
+    task = asyncio.current_task()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, task.cancel)
+    
+    # A stdin pipe from the server outlives it only until the server dies,
+    # even if it is killed before it can terminate the daemon
+    watcher = None
+    if stat.S_ISFIFO(os.fstat(sys.stdin.fileno()).st_mode):
+        watcher = asyncio.create_task(_watch_parent(task))
+    
+    try:
+        await LSPDaemon().serve()
+    except asyncio.CancelledError:
+        logger.info("LSP daemon stopped")
+    finally:
+        if watcher:
+            watcher.cancel()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=getattr(logging, Config.LOG_LEVEL),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        stream=sys.stderr,
+    )
+    uvloop.run(main())
\ No newline at end of file
@@ -1,83 +1,134 @@
 """Mock LSP server for testing."""
 
 import asyncio
-from typing import Any, Dict, List, Optional
+import functools
+from types import MappingProxyType
+from typing import Any, List, Mapping, Optional, Sequence, Tuple
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively make a response read-only so cached copies can be shared."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+@functools.lru_cache(maxsize=4096)
+def _mock_definition(file_uri: str, line: int, character: int) -> Mapping[str, Any]:
+    """Build the mock definition for a position."""
+    return _freeze({
+        "uri": file_uri,
+        "range": {
+            "start": {"line": line, "character": 0},
+            "end": {"line": line, "character": 80}
+        }
+    })
+
+
+@functools.lru_cache(maxsize=4096)
+def _mock_references(
+    file_uri: str,
+    line: int,
+    character: int
+) -> Sequence[Mapping[str, Any]]:
+    """Build the mock references for a position."""
+    return _freeze([
+        {
+            "uri": file_uri,
+            "range": {
+                "start": {"line": line, "character": 0},
+                "end": {"line": line, "character": 80}
+            }
+        },
+        {
+            "uri": file_uri,
+            "range": {
+                "start": {"line": line + 10, "character": 5},
+                "end": {"line": line + 10, "character": 25}
+            }
+        }
+    ])
+
+
+# Document symbols do not depend on the file, so one shared copy suffices
+_MOCK_SYMBOLS: Tuple[Mapping[str, Any], ...] = _freeze([
+    {
+        "name": "MockClass",
+        "kind": 5,  # Class
+        "range": {
+            "start": {"line": 5, "character": 0},
+            "end": {"line": 15, "character": 0}
+        },
+        "selectionRange": {
+            "start": {"line": 5, "character": 6},
+            "end": {"line": 5, "character": 15}
+        }
+    },
+    {
+        "name": "mock_function",
+        "kind": 12,  # Function
+        "range": {
+            "start": {"line": 20, "character": 0},
+            "end": {"line": 25, "character": 0}
+        },
+        "selectionRange": {
+            "start": {"line": 20, "character": 4},
+            "end": {"line": 20, "character": 17}
+        }
+    }
+])
 
 
 class MockLSPServerProcess:
-    """Mock LSP server process for testing."""
+    """Mock LSP server process for testing.
+    
+    Responses are memoized per input and returned as shared read-only
+    mappings, so repeated queries return the same object.
+    """
     
-    def __init__(self, language: str, command: List[str]):
-        """Initialize mock LSP server process."""
+    def __init__(self, language: str, command: List[str], startup_delay: float = 0.0):
+        """Initialize mock LSP server process.
+        
+        startup_delay simulates server start and stop time, in seconds.
+        """
         self.language = language
         self.command = command
+        self.startup_delay = startup_delay
         self.started = False
         self._request_id = 0
     
     async def start(self):
         """Start the mock language server process."""
-        await asyncio.sleep(0.01)  # Simulate startup time
+        if self.startup_delay:
+            await asyncio.sleep(self.startup_delay)  # Simulate startup time
         self.started = True
     
     async def stop(self):
         """Stop the mock language server process."""
-        await asyncio.sleep(0.01)  # Simulate shutdown time
+        if self.startup_delay:
+            await asyncio.sleep(self.startup_delay)  # Simulate shutdown time
         self.started = False
     
-    async def get_definition(self, file_uri: str, line: int, character: int) -> Optional[Dict[str, Any]]:
+    async def get_definition(
+        self,
+        file_uri: str,
+        line: int,
+        character: int
+    ) -> Optional[Mapping[str, Any]]:
         """Get mock definition location."""
-        return {
-            "uri": file_uri,
-            "range": {
-                "start": {"line": line, "character": 0},
-                "end": {"line": line, "character": 80}
-            }
-        }
+        return _mock_definition(file_uri, line, character)
     
-    async def get_references(self, file_uri: str, line: int, character: int) -> List[Dict[str, Any]]:
+    async def get_references(
+        self,
+        file_uri: str,
+        line: int,
+        character: int
+    ) -> Sequence[Mapping[str, Any]]:
         """Get mock references."""
-        return [
-            {
-                "uri": file_uri,
-                "range": {
-                    "start": {"line": line, "character": 0},
-                    "end": {"line": line, "character": 80}
-                }
-            },
-            {
-                "uri": file_uri,
-                "range": {
-                    "start": {"line": line + 10, "character": 5},
-                    "end": {"line": line + 10, "character": 25}
-                }
-            }
-        ]
+        return _mock_references(file_uri, line, character)
     
-    async def get_symbols(self, file_uri: str) -> List[Dict[str, Any]]:
+    async def get_symbols(self, file_uri: str) -> Sequence[Mapping[str, Any]]:
         """Get mock document symbols."""
-        return [
-            {
-                "name": "MockClass",
-                "kind": 5,  # Class
-                "range": {
-                    "start": {"line": 5, "character": 0},
-                    "end": {"line": 15, "character": 0}
-                },
-                "selectionRange": {
-                    "start": {"line": 5, "character": 6},
-                    "end": {"line": 5, "character": 15}
-                }
-            },
-            {
-                "name": "mock_function",
-                "kind": 12,  # Function
-                "range": {
-                    "start": {"line": 20, "character": 0},
-                    "end": {"line": 25, "character": 0}
-                },
-                "selectionRange": {
-                    "start": {"line": 20, "character": 4},
-                    "end": {"line": 20, "character": 17}
-                }
-            }
-        ]
\ No newline at end of file
+        return _MOCK_SYMBOLS
\ No newline at end of file
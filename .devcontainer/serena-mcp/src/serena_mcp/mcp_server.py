@@ -3,27 +3,45 @@
 import asyncio
 import logging
 import os
-import signal
+import subprocess
 import sys
+import time
 from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Any, Dict
 
+import fastapi
 import uvicorn
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
 from .config import Config
 from .context_manager import ContextManager
 from .lsp_client import LSPClient
+from .lsp_daemon import LSPDaemonClient
+
+# Resolve the log level once for logging and uvicorn
+_LOG_LEVEL_INT = getattr(logging, Config.LOG_LEVEL)
+_LOG_LEVEL_STR = Config.LOG_LEVEL.lower()
 
 # Configure logging
 logging.basicConfig(
-    level=getattr(logging, Config.LOG_LEVEL),
+    level=_LOG_LEVEL_INT,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 logger = logging.getLogger(__name__)
 
+# FastAPI 0.130+ encodes response models with pydantic's dump_json, which beats
+# ORJSONResponse but is skipped whenever a response class is set explicitly
+_PYDANTIC_DUMP_JSON = tuple(map(int, fastapi.__version__.split(".")[:2])) >= (0, 130)
+_RESPONSE_CLASS_KWARGS: Dict[str, Any] = (
+    {} if _PYDANTIC_DUMP_JSON else {"default_response_class": ORJSONResponse}
+)
+
+# Time allowed for in-flight requests to finish after SIGINT/SIGTERM
+GRACEFUL_SHUTDOWN_SECONDS = 10
+
 
 class ContextRequest(BaseModel):
     """Request model for context retrieval."""
@@ -45,23 +63,32 @@ async def lifespan(app: FastAPI):
     """Manage application lifecycle."""
     # Startup
     logger.info("Starting Serena-MCP server...")
-    app.state.lsp_client = LSPClient()
-    app.state.context_manager = ContextManager(app.state.lsp_client)
     
-    # Initialize LSP connections
-    await app.state.lsp_client.initialize()
+    # Workers share the daemon's language servers when one is running
+    lsp_client = LSPDaemonClient(Config.LSP_SOCKET_PATH)
+    try:
+        await lsp_client.initialize()
+    except OSError:
+        logger.info("No LSP daemon available, starting language servers in-process")
+        lsp_client = LSPClient()
+        await lsp_client.initialize()
     
-    yield
+    app.state.lsp_client = lsp_client
+    app.state.context_manager = ContextManager(lsp_client)
     
-    # Shutdown
-    logger.info("Shutting down Serena-MCP server...")
-    await app.state.lsp_client.shutdown()
+    try:
+        yield
+    finally:
+        # Shutdown, once uvicorn has drained in-flight requests
+        logger.info("Shutting down Serena-MCP server...")
+        await app.state.lsp_client.shutdown()
 
 
 app = FastAPI(
     title="Serena-MCP",
     version="0.1.0",
     lifespan=lifespan,
+    **_RESPONSE_CLASS_KWARGS,
 )
 
 
@@ -75,50 +102,90 @@ async def health_check():
 async def get_context(request: ContextRequest):
     """Get context for the given query."""
     try:
-        context = await app.state.context_manager.get_context(
-            query=request.query,
-            scope=request.scope,
-            max_tokens=request.max_tokens,
-        )
+        # Bound the request so a slow language server cannot stall the worker
+        async with asyncio.timeout(Config.LSP_TIMEOUT_MS / 1000):
+            context = await app.state.context_manager.get_context(
+                query=request.query,
+                scope=request.scope,
+                max_tokens=request.max_tokens,
+            )
         return context
+    except TimeoutError:
+        logger.error(f"Timed out getting context for: {request.query}")
+        raise HTTPException(status_code=504, detail="Context extraction timed out")
     except Exception as e:
         logger.error(f"Error getting context: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-def handle_shutdown(signum, frame):
-    """Handle shutdown signals."""
-    logger.info(f"Received signal {signum}, shutting down...")
-    sys.exit(0)
+def start_lsp_daemon() -> subprocess.Popen:
+    """Launch the shared LSP daemon and wait for its socket to appear."""
+    lsp_socket = Path(Config.LSP_SOCKET_PATH)
+    if lsp_socket.exists():
+        lsp_socket.unlink()
+    
+    # Own session, so a terminal Ctrl-C cannot stop it while workers still drain.
+    # The daemon exits when its stdin pipe closes, so it never outlives us.
+    daemon = subprocess.Popen(
+        [sys.executable, "-m", "serena_mcp.lsp_daemon"],
+        stdin=subprocess.PIPE,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + 10
+    while not lsp_socket.exists():
+        if daemon.poll() is not None or time.monotonic() > deadline:
+            logger.warning(
+                "LSP daemon did not start, workers will run their own language servers"
+            )
+            break
+        time.sleep(0.05)
+    
+    return daemon
 
 
 def main():
     """Main entry point."""
-    # Set up signal handlers
-    signal.signal(signal.SIGINT, handle_shutdown)
-    signal.signal(signal.SIGTERM, handle_shutdown)
-    
-    # Remove existing socket if it exists
+    # Remove a socket left behind by an unclean exit
     socket_path = Path(Config.SOCKET_PATH)
     if socket_path.exists():
         socket_path.unlink()
     
-    # Run server
+    # Run server; uvicorn handles SIGINT/SIGTERM and drains in-flight requests
     if Config.DEBUG:
         # HTTP mode for debugging
         uvicorn.run(
             "serena_mcp.mcp_server:app",
             host=Config.HOST,
             port=Config.PORT,
-            reload=True,
+            reload=Config.RELOAD,
+            loop="uvloop",
+            http="httptools",
+            timeout_graceful_shutdown=GRACEFUL_SHUTDOWN_SECONDS,
         )
     else:
-        # Unix socket mode for production
-        uvicorn.run(
-            app,
-            uds=Config.SOCKET_PATH,
-            log_level=Config.LOG_LEVEL.lower(),
-        )
+        # Unix socket mode for production; workers need the import string.
+        # One daemon serves every worker, so each language server runs once.
+        daemon = start_lsp_daemon()
+        try:
+            uvicorn.run(
+                "serena_mcp.mcp_server:app",
+                uds=Config.SOCKET_PATH,
+                workers=Config.WORKERS or os.cpu_count(),
+                log_level=_LOG_LEVEL_STR,
+                loop="uvloop",
+                http="httptools",
+                timeout_graceful_shutdown=GRACEFUL_SHUTDOWN_SECONDS,
+            )
+        finally:
+            daemon.stdin.close()
+            daemon.terminate()
+            try:
+                daemon.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                daemon.kill()
+                daemon.wait()
+            # Workers share the socket, so only remove it once all have drained
+            socket_path.unlink(missing_ok=True)
 
 
 if __name__ == "__main__":
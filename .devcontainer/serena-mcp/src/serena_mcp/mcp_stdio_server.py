@@ -2,34 +2,134 @@
 """MCP stdio server wrapper for Serena-MCP."""
 
 import asyncio
-import json
 import logging
+import os
+import stat
 import sys
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 
-from .cache_manager import CacheManager
+import orjson
+import uvloop
+
+from .cache_manager import get_cache_manager
 from .config import Config
 from .context_manager import ContextManager
 from .lsp_client import LSPClient
 
+# Resolve the log level once for logging
+_LOG_LEVEL_INT = getattr(logging, Config.LOG_LEVEL)
+
 # Configure logging
 logging.basicConfig(
-    level=getattr(logging, Config.LOG_LEVEL),
+    level=_LOG_LEVEL_INT,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     stream=sys.stderr  # Log to stderr to keep stdout clean for JSON-RPC
 )
 logger = logging.getLogger(__name__)
 
+# Largest single JSON-RPC line accepted on stdin
+STDIN_LINE_LIMIT = 64 * 1024 * 1024
+
+# Requests arriving this close together are handled and flushed as one batch
+BATCH_MAX_WAIT = 0.002
+BATCH_MAX_SIZE = 32
+
+# Tool schemas shared by the initialize and tools/list results
+_TOOL_SCHEMAS = (
+    {
+        "name": "find_symbol",
+        "description": "Find symbol definitions across the codebase",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "symbol_name": {"type": "string"},
+                "language": {"type": "string"}
+            },
+            "required": ["symbol_name"]
+        }
+    },
+    {
+        "name": "get_context",
+        "description": "Get context for a specific file or symbol",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "query": {"type": "string"}
+            },
+            "required": ["query"]
+        }
+    },
+    {
+        "name": "apply_edit",
+        "description": "Apply semantic edits to code",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "file_path": {"type": "string"},
+                "edits": {"type": "array"}
+            },
+            "required": ["file_path", "edits"]
+        }
+    },
+)
+
+# Static results for the handshake methods, built once at import
+_INIT_RESULT = {
+    "protocolVersion": "2025-06-18",
+    "capabilities": {
+        "tools": {
+            schema["name"]: {k: v for k, v in schema.items() if k != "name"}
+            for schema in _TOOL_SCHEMAS
+        }
+    },
+    "serverInfo": {
+        "name": "serena-mcp",
+        "version": "1.0.0"
+    }
+}
+
+_TOOLS_LIST_RESULT = {"tools": _TOOL_SCHEMAS}
+
+
+def _response_template(result: Dict[str, Any]) -> bytes:
+    """Serialize a constant-result response with a %d slot for the request id."""
+    body = orjson.dumps(result).replace(b"%", b"%%")
+    return b'{"jsonrpc":"2.0","id":%d,"result":' + body + b'}\n'
+
+
+# Fully serialized handshake responses, keyed by method, for integer ids
+_RESPONSE_TEMPLATES = {
+    "initialize": _response_template(_INIT_RESULT),
+    "tools/list": _response_template(_TOOLS_LIST_RESULT),
+}
+
 
 class MCPStdioServer:
     """MCP stdio server implementation."""
     
     def __init__(self):
-        self.cache_manager = CacheManager()
+        self.cache_manager = get_cache_manager()
         self.lsp_client = LSPClient()
         self.context_manager = ContextManager(self.lsp_client)
         self.request_id_counter = 0
         
+        # Responses accumulate here and go out in one write per flush
+        self._out = sys.stdout.buffer
+        self._buf = bytearray()
+        
+        # Dispatch tables for JSON-RPC methods and MCP tools
+        self._methods: Dict[str, Callable[[Dict[str, Any]], Awaitable[Any]]] = {
+            "initialize": self._handle_initialize,
+            "tools/call": self._handle_tools_call,
+            "tools/list": self._handle_tools_list,
+            "shutdown": self._handle_shutdown,
+        }
+        self._tools: Dict[str, Callable[[Dict[str, Any]], Awaitable[Any]]] = {
+            "find_symbol": self._call_find_symbol,
+            "get_context": self._call_get_context,
+            "apply_edit": self._call_apply_edit,
+        }
+        
     async def initialize(self):
         """Initialize the server components."""
         await self.lsp_client.initialize()
@@ -40,173 +140,206 @@ class MCPStdioServer:
         await self.lsp_client.shutdown()
         logger.info("Serena MCP stdio server shutdown")
         
-    def write_response(self, response: Dict[str, Any]):
-        """Write JSON-RPC response to stdout."""
-        response_str = json.dumps(response)
-        sys.stdout.write(f"{response_str}\n")
-        sys.stdout.flush()
+    def write_response(self, response: Union[Dict[str, Any], bytes]):
+        """Queue JSON-RPC response for the next flush_responses().
+        
+        Bytes are taken as an already serialized, newline-terminated response.
+        """
+        if isinstance(response, bytes):
+            self._buf += response
+            return
+        self._buf += orjson.dumps(response)
+        self._buf += b"\n"
+        
+    def flush_responses(self):
+        """Write queued responses to stdout with a single write and flush."""
+        if self._buf:
+            self._out.write(self._buf)
+            self._out.flush()
+            self._buf.clear()
         
-    async def handle_request(self, request: Dict[str, Any]):
-        """Handle JSON-RPC request."""
+    async def handle_request(
+        self,
+        request: Dict[str, Any]
+    ) -> Optional[Union[Dict[str, Any], bytes]]:
+        """Handle JSON-RPC request and return its response, if any."""
         method = request.get("method")
         params = request.get("params", {})
         request_id = request.get("id")
         
+        # Handshake results are constant, so only the id needs formatting
+        if type(request_id) is int and method in _RESPONSE_TEMPLATES:
+            return _RESPONSE_TEMPLATES[method] % request_id
+        
         try:
-            if method == "initialize":
-                result = {
-                    "protocolVersion": "2025-06-18",
-                    "capabilities": {
-                        "tools": {
-                            "find_symbol": {
-                                "description": "Find symbol definitions across the codebase",
-                                "inputSchema": {
-                                    "type": "object",
-                                    "properties": {
-                                        "symbol_name": {"type": "string"},
-                                        "language": {"type": "string"}
-                                    },
-                                    "required": ["symbol_name"]
-                                }
-                            },
-                            "get_context": {
-                                "description": "Get context for a specific file or symbol",
-                                "inputSchema": {
-                                    "type": "object",
-                                    "properties": {
-                                        "query": {"type": "string"}
-                                    },
-                                    "required": ["query"]
-                                }
-                            },
-                            "apply_edit": {
-                                "description": "Apply semantic edits to code",
-                                "inputSchema": {
-                                    "type": "object",
-                                    "properties": {
-                                        "file_path": {"type": "string"},
-                                        "edits": {"type": "array"}
-                                    },
-                                    "required": ["file_path", "edits"]
-                                }
-                            }
-                        }
-                    },
-                    "serverInfo": {
-                        "name": "serena-mcp",
-                        "version": "1.0.0"
-                    }
-                }
-                
-            elif method == "tools/call":
-                tool_name = params.get("name")
-                tool_params = params.get("arguments", {})
-                
-                if tool_name == "find_symbol":
-                    result = await self.context_manager.find_symbol(
-                        tool_params.get("symbol_name"),
-                        tool_params.get("language")
-                    )
-                elif tool_name == "get_context":
-                    result = await self.context_manager.get_context(
-                        tool_params.get("query")
-                    )
-                elif tool_name == "apply_edit":
-                    result = await self.context_manager.apply_edit(
-                        tool_params.get("file_path"),
-                        tool_params.get("edits")
-                    )
-                else:
-                    raise ValueError(f"Unknown tool: {tool_name}")
-                    
-            elif method == "tools/list":
-                result = {
-                    "tools": [
-                        {
-                            "name": "find_symbol",
-                            "description": "Find symbol definitions across the codebase",
-                            "inputSchema": {
-                                "type": "object",
-                                "properties": {
-                                    "symbol_name": {"type": "string"},
-                                    "language": {"type": "string"}
-                                },
-                                "required": ["symbol_name"]
-                            }
-                        },
-                        {
-                            "name": "get_context",
-                            "description": "Get context for a specific file or symbol",
-                            "inputSchema": {
-                                "type": "object",
-                                "properties": {
-                                    "query": {"type": "string"}
-                                },
-                                "required": ["query"]
-                            }
-                        },
-                        {
-                            "name": "apply_edit",
-                            "description": "Apply semantic edits to code",
-                            "inputSchema": {
-                                "type": "object",
-                                "properties": {
-                                    "file_path": {"type": "string"},
-                                    "edits": {"type": "array"}
-                                },
-                                "required": ["file_path", "edits"]
-                            }
-                        }
-                    ]
-                }
-                
-            elif method == "shutdown":
-                await self.shutdown()
-                result = {}
-                
-            else:
+            handler = self._methods.get(method)
+            if handler is None:
                 raise ValueError(f"Unknown method: {method}")
+            result = await handler(params)
                 
             if request_id is not None:
-                self.write_response({
+                return {
                     "jsonrpc": "2.0",
                     "id": request_id,
                     "result": result
-                })
+                }
                 
         except Exception as e:
-            logger.error(f"Error handling request: {e}")
+            logger.error("Error handling request: %s", e)
             if request_id is not None:
-                self.write_response({
+                return {
                     "jsonrpc": "2.0",
                     "id": request_id,
                     "error": {
                         "code": -32603,
                         "message": str(e)
                     }
-                })
+                }
+        
+        return None
                 
+    async def _handle_initialize(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle the initialize handshake."""
+        return _INIT_RESULT
+    
+    async def _handle_tools_list(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """List the available tools."""
+        return _TOOLS_LIST_RESULT
+    
+    async def _handle_shutdown(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Shut the server components down."""
+        await self.shutdown()
+        return {}
+    
+    async def _handle_tools_call(self, params: Dict[str, Any]) -> Any:
+        """Dispatch a tools/call request to the named tool."""
+        tool_name = params.get("name")
+        tool = self._tools.get(tool_name)
+        if tool is None:
+            raise ValueError(f"Unknown tool: {tool_name}")
+        return await tool(params.get("arguments", {}))
+    
+    async def _call_find_symbol(self, tool_params: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the find_symbol tool."""
+        return await self.context_manager.find_symbol(
+            tool_params.get("symbol_name"),
+            tool_params.get("language")
+        )
+    
+    async def _call_get_context(self, tool_params: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the get_context tool."""
+        return await self.context_manager.get_context(
+            tool_params.get("query")
+        )
+    
+    async def _call_apply_edit(self, tool_params: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the apply_edit tool."""
+        return await self.context_manager.apply_edit(
+            tool_params.get("file_path"),
+            tool_params.get("edits")
+        )
+    
+    async def process_line(self, line: bytes) -> Optional[Union[Dict[str, Any], bytes]]:
+        """Parse and handle one line of JSON-RPC input."""
+        try:
+            request = orjson.loads(line)
+            return await self.handle_request(request)
+        except orjson.JSONDecodeError as e:
+            logger.error("Invalid JSON: %s", e)
+        except Exception as e:
+            logger.error("Error processing request: %s", e)
+        return None
+    
+    async def process_batch(self, lines: List[bytes]):
+        """Handle a batch of lines concurrently, flushing responses as they finish.
+        
+        Responses that complete in the same loop iteration share one flush, so a
+        slow request never holds back the fast ones batched with it.
+        """
+        tasks = [asyncio.create_task(self.process_line(line)) for line in lines]
+        pending = set(tasks)
+        
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            # Each response stays on its own line, in request order
+            for task in tasks:
+                if task in done and (response := task.result()) is not None:
+                    self.write_response(response)
+            self.flush_responses()
+    
+    async def _drain_batch(
+        self,
+        reader: asyncio.StreamReader,
+        max_wait: float = BATCH_MAX_WAIT,
+        max_n: int = BATCH_MAX_SIZE
+    ) -> Tuple[List[bytes], bool]:
+        """Read one line plus any arriving within max_wait; returns (lines, eof)."""
+        lines: List[bytes] = []
+        timeout = None
+        
+        while len(lines) < max_n:
+            try:
+                line = await asyncio.wait_for(reader.readline(), timeout)
+            except asyncio.TimeoutError:
+                break
+            except ValueError as e:
+                logger.error("Request too large: %s", e)
+                continue
+            if not line:
+                return lines, True
+            if line == b"\n" or line == b"\r\n":
+                continue  # Blank keepalive, not worth a parse error
+            lines.append(line)
+            timeout = max_wait
+        
+        return lines, False
+    
+    async def _feed_from_file(self, reader: asyncio.StreamReader):
+        """Feed stdin lines to reader from a thread, for regular-file stdin."""
+        while line := await asyncio.to_thread(sys.stdin.buffer.readline):
+            reader.feed_data(line)
+        reader.feed_eof()
+    
     async def run(self):
         """Run the stdio server."""
         await self.initialize()
         
+        # Read stdin without blocking the event loop so requests run concurrently
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader(limit=STDIN_LINE_LIMIT)
+        feeder = None
+        in_flight = set()
+        
         try:
-            while True:
-                line = sys.stdin.readline()
-                if not line:
-                    break
-                    
-                try:
-                    request = json.loads(line.strip())
-                    await self.handle_request(request)
-                except json.JSONDecodeError as e:
-                    logger.error(f"Invalid JSON: {e}")
-                except Exception as e:
-                    logger.error(f"Error processing request: {e}")
-                    
+            if stat.S_ISREG(os.fstat(sys.stdin.fileno()).st_mode):
+                # Regular files cannot be watched by the event loop
+                feeder = asyncio.create_task(self._feed_from_file(reader))
+            else:
+                await loop.connect_read_pipe(
+                    lambda: asyncio.StreamReaderProtocol(reader), sys.stdin
+                )
+            
+            eof = False
+            while not eof:
+                lines, eof = await self._drain_batch(reader)
+                if not lines:
+                    continue
+                
+                # Writes are synchronous, so batches never interleave output
+                task = asyncio.create_task(self.process_batch(lines))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            
+            if in_flight:
+                await asyncio.gather(*in_flight)
+                
         except KeyboardInterrupt:
             logger.info("Received interrupt signal")
         finally:
+            if feeder:
+                feeder.cancel()
             await self.shutdown()
 
 
@@ -217,4 +350,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    uvloop.run(main())
\ No newline at end of file